@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
@@ -17,303 +18,425 @@ down_revision: Union[str, None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+SET_UPDATED_AT_FUNCTION = """
+CREATE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""".strip()
+
+# Append-only tables range-partitioned on created_at. The migration creates
+# partitions for the current month and PARTITION_MONTHS_AHEAD months after
+# it; a periodic call (e.g. monthly from pg_cron) of
+#     SELECT create_monthly_partitions('<table>', 3)
+# keeps the window moving. The default partition only catches rows that
+# arrive before their month exists.
+PARTITIONED_TABLES = ('webhook_deliveries', 'audit_log')
+PARTITION_MONTHS_AHEAD = 3
+
+CREATE_MONTHLY_PARTITIONS_FUNCTION = """
+CREATE FUNCTION create_monthly_partitions(parent text, months_ahead integer) RETURNS void AS $$
+DECLARE
+    month_start date;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', now()) + make_interval(months => i))::date;
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(month_start, 'YYYY_MM'),
+            parent,
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+    END LOOP;
+END
+$$ LANGUAGE plpgsql
+""".strip()
+
+
+def _create_partitions(table: str) -> list[str]:
+    """Render the initial monthly and default partitions for a partitioned table."""
+    return [
+        f"SELECT create_monthly_partitions('{table}', {PARTITION_MONTHS_AHEAD})",
+        f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT',
+    ]
+
+
+def _compile(element: sa.schema.ExecutableDDLElement) -> str:
+    """Render a DDL construct as PostgreSQL SQL."""
+    return str(element.compile(dialect=postgresql.dialect())).strip()
+
+
+metadata = sa.MetaData()
+
+# document_type, status and confidence_level are SMALLINT codes mapped by
+# the IntEnums in src/core/enums.py (0 = unknown / pending)
+#
+# Externally exposed entities keep UUID keys. Internal append-heavy child and
+# log tables use monotonic BIGINT keys so inserts hit the rightmost btree leaf;
+# the partitioned tables use BIGSERIAL since identity columns on partitioned
+# tables need PostgreSQL 17.
+
+# Documents table
+documents = sa.Table(
+    'documents',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('external_id', sa.String(255), nullable=True),
+    sa.Column('filename', sa.String(500), nullable=False),
+    sa.Column('original_filename', sa.String(500), nullable=False),
+    sa.Column('mime_type', sa.String(100), nullable=False),
+    sa.Column('file_size_bytes', sa.BigInteger, nullable=False),
+    # Raw digest bytes (not hex) to halve the unique index
+    sa.Column('file_hash', postgresql.BYTEA, nullable=False, unique=True),
+    sa.Column('storage_path', sa.String(1000), nullable=False),
+    sa.Column('document_type', sa.SmallInteger, server_default='0'),
+    sa.Column('document_type_confidence', sa.Float, nullable=True),
+    sa.Column('page_count', sa.Integer, server_default='1'),
+    sa.Column('status', sa.SmallInteger, server_default='0'),
+    sa.Column('error_message', sa.Text, nullable=True),
+    sa.Column('processing_started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processing_completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processing_duration_ms', sa.Integer, nullable=True),
+    sa.Column('model_used', sa.String(100), nullable=True),
+    sa.Column('tokens_used', sa.Integer, nullable=True),
+    sa.Column('cost_usd', sa.Numeric(10, 6), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.Column('created_by', sa.String(255), nullable=True),
+)
+
+# Extractions table
+extractions = sa.Table(
+    'extractions',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('page_number', sa.Integer, server_default='1'),
+    sa.Column('raw_response', postgresql.JSONB, nullable=False),
+    sa.Column('structured_data', postgresql.JSONB, nullable=False),
+    sa.Column('confidence_score', sa.Float, nullable=True),
+    sa.Column('confidence_level', sa.SmallInteger, nullable=True),
+    sa.Column('extraction_model', sa.String(100), nullable=True),
+    sa.Column('prompt_version', sa.String(50), nullable=True),
+    sa.Column('tokens_input', sa.Integer, nullable=True),
+    sa.Column('tokens_output', sa.Integer, nullable=True),
+    sa.Column('is_validated', sa.Boolean, server_default='false'),
+    sa.Column('validated_by', sa.String(255), nullable=True),
+    sa.Column('validated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('validation_corrections', postgresql.JSONB, nullable=True),
+    sa.Column('embedding', Vector(1536), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.UniqueConstraint('document_id', 'page_number', name='unique_doc_page'),
+)
+
+# Invoices table
+invoices = sa.Table(
+    'invoices',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
+    sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('invoice_number', sa.String(100), nullable=True),
+    sa.Column('invoice_date', sa.Date, nullable=True),
+    sa.Column('due_date', sa.Date, nullable=True),
+    sa.Column('purchase_order_number', sa.String(100), nullable=True),
+    sa.Column('vendor_name', sa.String(500), nullable=True),
+    sa.Column('vendor_address', sa.Text, nullable=True),
+    sa.Column('vendor_tax_id', sa.String(50), nullable=True),
+    sa.Column('vendor_email', sa.String(255), nullable=True),
+    sa.Column('vendor_phone', sa.String(50), nullable=True),
+    sa.Column('customer_name', sa.String(500), nullable=True),
+    sa.Column('customer_address', sa.Text, nullable=True),
+    sa.Column('customer_account_number', sa.String(100), nullable=True),
+    sa.Column('subtotal', sa.Numeric(15, 2), nullable=True),
+    sa.Column('tax_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('tax_rate', sa.Numeric(5, 2), nullable=True),
+    sa.Column('discount_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('shipping_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('total_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('currency', sa.String(3), server_default='USD'),
+    sa.Column('payment_terms', sa.String(100), nullable=True),
+    sa.Column('payment_method', sa.String(100), nullable=True),
+    sa.Column('bank_account', sa.String(100), nullable=True),
+    sa.Column('notes', sa.Text, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Invoice line items
+invoice_line_items = sa.Table(
+    'invoice_line_items',
+    metadata,
+    sa.Column('id', sa.BigInteger, sa.Identity(always=True), primary_key=True),
+    sa.Column('invoice_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('invoices.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('line_number', sa.Integer, nullable=True),
+    sa.Column('item_code', sa.String(100), nullable=True),
+    sa.Column('description', sa.Text, nullable=False),
+    sa.Column('quantity', sa.Numeric(15, 4), nullable=True),
+    sa.Column('unit', sa.String(50), nullable=True),
+    sa.Column('unit_price', sa.Numeric(15, 4), nullable=True),
+    sa.Column('discount_percent', sa.Numeric(5, 2), nullable=True),
+    sa.Column('tax_percent', sa.Numeric(5, 2), nullable=True),
+    sa.Column('line_total', sa.Numeric(15, 2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Receipts table
+receipts = sa.Table(
+    'receipts',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
+    sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('merchant_name', sa.String(500), nullable=True),
+    sa.Column('merchant_address', sa.Text, nullable=True),
+    sa.Column('merchant_phone', sa.String(50), nullable=True),
+    sa.Column('receipt_number', sa.String(100), nullable=True),
+    sa.Column('transaction_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('subtotal', sa.Numeric(15, 2), nullable=True),
+    sa.Column('tax_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('tip_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('total_amount', sa.Numeric(15, 2), nullable=True),
+    sa.Column('currency', sa.String(3), server_default='USD'),
+    sa.Column('payment_method', sa.String(100), nullable=True),
+    sa.Column('card_last_four', sa.String(4), nullable=True),
+    sa.Column('category', sa.String(100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Receipt line items
+receipt_line_items = sa.Table(
+    'receipt_line_items',
+    metadata,
+    sa.Column('id', sa.BigInteger, sa.Identity(always=True), primary_key=True),
+    sa.Column('receipt_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('receipts.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('description', sa.Text, nullable=False),
+    sa.Column('quantity', sa.Numeric(10, 3), server_default='1'),
+    sa.Column('unit_price', sa.Numeric(15, 2), nullable=True),
+    sa.Column('line_total', sa.Numeric(15, 2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Menus table
+menus = sa.Table(
+    'menus',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
+    sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('restaurant_name', sa.String(500), nullable=True),
+    sa.Column('cuisine_type', sa.String(100), nullable=True),
+    sa.Column('menu_type', sa.String(50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Menu items
+menu_items = sa.Table(
+    'menu_items',
+    metadata,
+    sa.Column('id', sa.BigInteger, sa.Identity(always=True), primary_key=True),
+    sa.Column('menu_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('menus.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('category', sa.String(200), nullable=True),
+    sa.Column('name', sa.String(500), nullable=False),
+    sa.Column('description', sa.Text, nullable=True),
+    sa.Column('price', sa.Numeric(10, 2), nullable=True),
+    sa.Column('currency', sa.String(3), server_default='USD'),
+    sa.Column('is_vegetarian', sa.Boolean, nullable=True),
+    sa.Column('is_vegan', sa.Boolean, nullable=True),
+    sa.Column('is_gluten_free', sa.Boolean, nullable=True),
+    sa.Column('is_spicy', sa.Boolean, nullable=True),
+    sa.Column('spice_level', sa.Integer, nullable=True),
+    sa.Column('allergens', postgresql.ARRAY(sa.String), nullable=True),
+    sa.Column('calories', sa.Integer, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+)
+
+# Extraction templates
+extraction_templates = sa.Table(
+    'extraction_templates',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('name', sa.String(255), nullable=False, unique=True),
+    sa.Column('document_type', sa.SmallInteger, nullable=False),
+    sa.Column('description', sa.Text, nullable=True),
+    sa.Column('system_prompt', sa.Text, nullable=False),
+    sa.Column('extraction_schema', postgresql.JSONB, nullable=False),
+    sa.Column('validation_rules', postgresql.JSONB, nullable=True),
+    sa.Column('examples', postgresql.JSONB, nullable=True),
+    sa.Column('is_active', sa.Boolean, server_default='true'),
+    sa.Column('version', sa.Integer, server_default='1'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.Column('created_by', sa.String(255), nullable=True),
+)
+
+# Webhook subscriptions
+webhook_subscriptions = sa.Table(
+    'webhook_subscriptions',
+    metadata,
+    sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+    sa.Column('url', sa.String(2000), nullable=False),
+    sa.Column('secret', sa.String(255), nullable=False),
+    sa.Column('events', postgresql.ARRAY(sa.String), nullable=False),
+    sa.Column('is_active', sa.Boolean, server_default='true'),
+    sa.Column('max_retries', sa.Integer, server_default='3'),
+    sa.Column('retry_delay_seconds', sa.Integer, server_default='60'),
+    sa.Column('total_delivered', sa.Integer, server_default='0'),
+    sa.Column('total_failed', sa.Integer, server_default='0'),
+    sa.Column('last_delivery_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_failure_reason', sa.Text, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    sa.Column('created_by', sa.String(255), nullable=True),
+)
+
+# Webhook deliveries (append-only, partitioned by month)
+webhook_deliveries = sa.Table(
+    'webhook_deliveries',
+    metadata,
+    sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+    sa.Column('subscription_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webhook_subscriptions.id'), nullable=False),
+    sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id'), nullable=True),
+    sa.Column('event_type', sa.String(100), nullable=False),
+    sa.Column('payload', postgresql.JSONB, nullable=False),
+    sa.Column('status', sa.String(50), nullable=True),
+    sa.Column('attempts', sa.Integer, server_default='0'),
+    sa.Column('response_status_code', sa.Integer, nullable=True),
+    sa.Column('response_body', sa.Text, nullable=True),
+    sa.Column('error_message', sa.Text, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), primary_key=True, server_default=sa.text('NOW()')),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    postgresql_partition_by='RANGE (created_at)',
+)
+
+# Audit log (append-only, partitioned by month)
+audit_log = sa.Table(
+    'audit_log',
+    metadata,
+    sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+    sa.Column('entity_type', sa.String(100), nullable=False),
+    sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('action', sa.String(50), nullable=False),
+    sa.Column('actor', sa.String(255), nullable=True),
+    sa.Column('old_values', postgresql.JSONB, nullable=True),
+    sa.Column('new_values', postgresql.JSONB, nullable=True),
+    sa.Column('ip_address', postgresql.INET, nullable=True),
+    sa.Column('user_agent', sa.Text, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), primary_key=True, server_default=sa.text('NOW()')),
+    postgresql_partition_by='RANGE (created_at)',
+)
+
+# Every foreign key column is indexed so cascading deletes and joins from
+# the parent do not scan the child table. document_id columns declared
+# unique (invoices, receipts, menus) are already covered by that index.
+# JSONB indexes use jsonb_path_ops, which is smaller and faster for @>.
+INDEXES = [
+    # Work queue scans only ever look at unfinished documents
+    sa.Index(
+        'idx_documents_status_active', documents.c.status, documents.c.created_at,
+        # pending, processing, extracting, validating, needs_review
+        postgresql_where=sa.text('status IN (0, 1, 2, 3, 6)'),
+    ),
+    sa.Index('idx_documents_type', documents.c.document_type),
+    # Covers the recent-documents listing so it can be served index-only
+    sa.Index(
+        'idx_documents_created_cover', documents.c.created_at.desc(),
+        postgresql_include=['filename', 'document_type', 'status', 'file_size_bytes'],
+    ),
+    sa.Index('idx_documents_external_id', documents.c.external_id),
+    sa.Index('idx_extractions_confidence', extractions.c.confidence_score),
+    sa.Index('idx_extractions_structured_gin', extractions.c.structured_data, postgresql_using='gin', postgresql_ops={'structured_data': 'jsonb_path_ops'}),
+    sa.Index(
+        'idx_extractions_embedding_hnsw', extractions.c.embedding,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    ),
+    sa.Index('idx_invoices_date', invoices.c.invoice_date),
+    sa.Index('idx_invoices_total', invoices.c.total_amount),
+    sa.Index('idx_invoices_extraction', invoices.c.extraction_id),
+    sa.Index('idx_line_items_invoice', invoice_line_items.c.invoice_id),
+    sa.Index('idx_receipts_transaction_at', receipts.c.transaction_at),
+    sa.Index('idx_receipts_category', receipts.c.category),
+    sa.Index('idx_receipts_extraction', receipts.c.extraction_id),
+    sa.Index('idx_receipt_line_items_receipt', receipt_line_items.c.receipt_id),
+    sa.Index('idx_menus_extraction', menus.c.extraction_id),
+    sa.Index('idx_menu_items_menu', menu_items.c.menu_id),
+    sa.Index('idx_menu_items_category', menu_items.c.category),
+    sa.Index('idx_extraction_templates_type_active', extraction_templates.c.document_type, postgresql_where=sa.text('is_active')),
+    sa.Index('idx_extraction_templates_schema_gin', extraction_templates.c.extraction_schema, postgresql_using='gin', postgresql_ops={'extraction_schema': 'jsonb_path_ops'}, postgresql_where=sa.text('is_active')),
+    sa.Index('idx_webhook_subscriptions_events_active', webhook_subscriptions.c.events, postgresql_using='gin', postgresql_where=sa.text('is_active')),
+    sa.Index('idx_webhook_deliveries_subscription', webhook_deliveries.c.subscription_id),
+    sa.Index('idx_webhook_deliveries_document', webhook_deliveries.c.document_id),
+    sa.Index('idx_webhook_deliveries_payload_gin', webhook_deliveries.c.payload, postgresql_using='gin', postgresql_ops={'payload': 'jsonb_path_ops'}),
+    sa.Index('idx_audit_entity', audit_log.c.entity_type, audit_log.c.entity_id),
+    # audit_log is append-only, so created_at follows physical order and a
+    # block-range index is enough for time-range filters
+    sa.Index('idx_audit_created_brin', audit_log.c.created_at, postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+]
+
+# Trigram GIN indexes are built online so re-runs against populated
+# tables do not block writers for the duration of the build
+CONCURRENT_INDEXES = [
+    sa.Index('idx_invoices_vendor_trgm', invoices.c.vendor_name, postgresql_using='gin', postgresql_ops={'vendor_name': 'gin_trgm_ops'}, postgresql_concurrently=True),
+    sa.Index('idx_line_items_description', invoice_line_items.c.description, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}, postgresql_concurrently=True),
+    sa.Index('idx_receipts_merchant_trgm', receipts.c.merchant_name, postgresql_using='gin', postgresql_ops={'merchant_name': 'gin_trgm_ops'}, postgresql_concurrently=True),
+    sa.Index('idx_menu_items_name_trgm', menu_items.c.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True),
+]
+
+
+# DDL is rendered once at import time so upgrade() only sends prepared text
+TABLES_DDL = ';\n'.join([
+    # Enable required extensions
+    'CREATE EXTENSION IF NOT EXISTS "uuid-ossp"',
+    'CREATE EXTENSION IF NOT EXISTS "pg_trgm"',
+    'CREATE EXTENSION IF NOT EXISTS "vector"',
+    *(_compile(sa.schema.CreateTable(table)) for table in metadata.sorted_tables),
+    CREATE_MONTHLY_PARTITIONS_FUNCTION,
+    *(statement for table in PARTITIONED_TABLES for statement in _create_partitions(table)),
+    # updated_at is maintained by the database so raw and bulk UPDATEs keep it fresh
+    SET_UPDATED_AT_FUNCTION,
+    *(
+        f'CREATE TRIGGER trg_{table}_updated BEFORE UPDATE ON {table} '
+        'FOR EACH ROW EXECUTE FUNCTION set_updated_at()'
+        for table in ('documents', 'extraction_templates')
+    ),
+])
+
+INDEXES_DDL = ';\n'.join(_compile(sa.schema.CreateIndex(index)) for index in INDEXES)
+
+CONCURRENT_INDEXES_DDL = [_compile(sa.schema.CreateIndex(index)) for index in CONCURRENT_INDEXES]
+
+
+def _create_tables() -> None:
+    """Create extensions, tables, partitions and triggers."""
+    # Send the whole schema as one script inside the migration transaction
+    # instead of one round-trip per table
+    op.execute(TABLES_DDL)
+
+
+def _create_indexes() -> None:
+    """Create secondary indexes, building the trigram indexes concurrently."""
+    op.execute(INDEXES_DDL)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for statement in CONCURRENT_INDEXES_DDL:
+            op.execute(statement)
+
 
 def upgrade() -> None:
     """Create initial database schema."""
-    # Enable required extensions
-    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
-    op.execute('CREATE EXTENSION IF NOT EXISTS "pg_trgm"')
-    op.execute('CREATE EXTENSION IF NOT EXISTS "pgvector"')
-
-    # Create enums
-    document_type_enum = postgresql.ENUM(
-        'invoice', 'receipt', 'menu', 'form', 'contract', 'unknown',
-        name='document_type',
-        create_type=True
-    )
-    document_type_enum.create(op.get_bind())
-
-    processing_status_enum = postgresql.ENUM(
-        'pending', 'processing', 'extracting', 'validating',
-        'completed', 'failed', 'needs_review',
-        name='processing_status',
-        create_type=True
-    )
-    processing_status_enum.create(op.get_bind())
-
-    confidence_level_enum = postgresql.ENUM(
-        'high', 'medium', 'low', 'very_low',
-        name='confidence_level',
-        create_type=True
-    )
-    confidence_level_enum.create(op.get_bind())
-
-    # Documents table
-    op.create_table(
-        'documents',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('external_id', sa.String(255), nullable=True),
-        sa.Column('filename', sa.String(500), nullable=False),
-        sa.Column('original_filename', sa.String(500), nullable=False),
-        sa.Column('mime_type', sa.String(100), nullable=False),
-        sa.Column('file_size_bytes', sa.BigInteger, nullable=False),
-        sa.Column('file_hash', sa.String(64), nullable=False, unique=True),
-        sa.Column('storage_path', sa.String(1000), nullable=False),
-        sa.Column('document_type', document_type_enum, server_default='unknown'),
-        sa.Column('document_type_confidence', sa.Float, nullable=True),
-        sa.Column('page_count', sa.Integer, server_default='1'),
-        sa.Column('status', processing_status_enum, server_default='pending'),
-        sa.Column('error_message', sa.Text, nullable=True),
-        sa.Column('processing_started_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('processing_completed_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('processing_duration_ms', sa.Integer, nullable=True),
-        sa.Column('model_used', sa.String(100), nullable=True),
-        sa.Column('tokens_used', sa.Integer, nullable=True),
-        sa.Column('cost_usd', sa.Numeric(10, 6), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), onupdate=sa.text('NOW()')),
-        sa.Column('created_by', sa.String(255), nullable=True),
-    )
-
-    op.create_index('idx_documents_status', 'documents', ['status'])
-    op.create_index('idx_documents_type', 'documents', ['document_type'])
-    op.create_index('idx_documents_created', 'documents', ['created_at'], postgresql_ops={'created_at': 'DESC'})
-    op.create_index('idx_documents_external_id', 'documents', ['external_id'])
-    op.create_index('idx_documents_hash', 'documents', ['file_hash'])
-
-    # Extractions table
-    op.create_table(
-        'extractions',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('page_number', sa.Integer, server_default='1'),
-        sa.Column('raw_response', postgresql.JSONB, nullable=False),
-        sa.Column('structured_data', postgresql.JSONB, nullable=False),
-        sa.Column('confidence_score', sa.Float, nullable=True),
-        sa.Column('confidence_level', confidence_level_enum, nullable=True),
-        sa.Column('extraction_model', sa.String(100), nullable=True),
-        sa.Column('prompt_version', sa.String(50), nullable=True),
-        sa.Column('tokens_input', sa.Integer, nullable=True),
-        sa.Column('tokens_output', sa.Integer, nullable=True),
-        sa.Column('is_validated', sa.Boolean, server_default='false'),
-        sa.Column('validated_by', sa.String(255), nullable=True),
-        sa.Column('validated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('validation_corrections', postgresql.JSONB, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.UniqueConstraint('document_id', 'page_number', name='unique_doc_page'),
-    )
-
-    op.create_index('idx_extractions_document', 'extractions', ['document_id'])
-    op.create_index('idx_extractions_confidence', 'extractions', ['confidence_score'])
-
-    # Invoices table
-    op.create_table(
-        'invoices',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
-        sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('invoice_number', sa.String(100), nullable=True),
-        sa.Column('invoice_date', sa.Date, nullable=True),
-        sa.Column('due_date', sa.Date, nullable=True),
-        sa.Column('purchase_order_number', sa.String(100), nullable=True),
-        sa.Column('vendor_name', sa.String(500), nullable=True),
-        sa.Column('vendor_address', sa.Text, nullable=True),
-        sa.Column('vendor_tax_id', sa.String(50), nullable=True),
-        sa.Column('vendor_email', sa.String(255), nullable=True),
-        sa.Column('vendor_phone', sa.String(50), nullable=True),
-        sa.Column('customer_name', sa.String(500), nullable=True),
-        sa.Column('customer_address', sa.Text, nullable=True),
-        sa.Column('customer_account_number', sa.String(100), nullable=True),
-        sa.Column('subtotal', sa.Numeric(15, 2), nullable=True),
-        sa.Column('tax_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('tax_rate', sa.Numeric(5, 2), nullable=True),
-        sa.Column('discount_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('shipping_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('total_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('currency', sa.String(3), server_default='USD'),
-        sa.Column('payment_terms', sa.String(100), nullable=True),
-        sa.Column('payment_method', sa.String(100), nullable=True),
-        sa.Column('bank_account', sa.String(100), nullable=True),
-        sa.Column('notes', sa.Text, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_invoices_vendor_trgm', 'invoices', ['vendor_name'], postgresql_using='gin', postgresql_ops={'vendor_name': 'gin_trgm_ops'})
-    op.create_index('idx_invoices_date', 'invoices', ['invoice_date'])
-    op.create_index('idx_invoices_total', 'invoices', ['total_amount'])
-
-    # Invoice line items
-    op.create_table(
-        'invoice_line_items',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('invoice_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('invoices.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('line_number', sa.Integer, nullable=True),
-        sa.Column('item_code', sa.String(100), nullable=True),
-        sa.Column('description', sa.Text, nullable=False),
-        sa.Column('quantity', sa.Numeric(15, 4), nullable=True),
-        sa.Column('unit', sa.String(50), nullable=True),
-        sa.Column('unit_price', sa.Numeric(15, 4), nullable=True),
-        sa.Column('discount_percent', sa.Numeric(5, 2), nullable=True),
-        sa.Column('tax_percent', sa.Numeric(5, 2), nullable=True),
-        sa.Column('line_total', sa.Numeric(15, 2), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_line_items_invoice', 'invoice_line_items', ['invoice_id'])
-    op.create_index('idx_line_items_description', 'invoice_line_items', ['description'], postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
-
-    # Receipts table
-    op.create_table(
-        'receipts',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
-        sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('merchant_name', sa.String(500), nullable=True),
-        sa.Column('merchant_address', sa.Text, nullable=True),
-        sa.Column('merchant_phone', sa.String(50), nullable=True),
-        sa.Column('receipt_number', sa.String(100), nullable=True),
-        sa.Column('transaction_date', sa.Date, nullable=True),
-        sa.Column('transaction_time', sa.Time, nullable=True),
-        sa.Column('subtotal', sa.Numeric(15, 2), nullable=True),
-        sa.Column('tax_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('tip_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('total_amount', sa.Numeric(15, 2), nullable=True),
-        sa.Column('currency', sa.String(3), server_default='USD'),
-        sa.Column('payment_method', sa.String(100), nullable=True),
-        sa.Column('card_last_four', sa.String(4), nullable=True),
-        sa.Column('category', sa.String(100), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_receipts_merchant_trgm', 'receipts', ['merchant_name'], postgresql_using='gin', postgresql_ops={'merchant_name': 'gin_trgm_ops'})
-    op.create_index('idx_receipts_date', 'receipts', ['transaction_date'])
-    op.create_index('idx_receipts_category', 'receipts', ['category'])
-
-    # Receipt line items
-    op.create_table(
-        'receipt_line_items',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('receipt_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('receipts.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('description', sa.Text, nullable=False),
-        sa.Column('quantity', sa.Numeric(10, 3), server_default='1'),
-        sa.Column('unit_price', sa.Numeric(15, 2), nullable=True),
-        sa.Column('line_total', sa.Numeric(15, 2), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_receipt_line_items_receipt', 'receipt_line_items', ['receipt_id'])
-
-    # Menus table
-    op.create_table(
-        'menus',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, unique=True),
-        sa.Column('extraction_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('extractions.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('restaurant_name', sa.String(500), nullable=True),
-        sa.Column('cuisine_type', sa.String(100), nullable=True),
-        sa.Column('menu_type', sa.String(50), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    # Menu items
-    op.create_table(
-        'menu_items',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('menu_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('menus.id', ondelete='CASCADE'), nullable=False),
-        sa.Column('category', sa.String(200), nullable=True),
-        sa.Column('name', sa.String(500), nullable=False),
-        sa.Column('description', sa.Text, nullable=True),
-        sa.Column('price', sa.Numeric(10, 2), nullable=True),
-        sa.Column('currency', sa.String(3), server_default='USD'),
-        sa.Column('is_vegetarian', sa.Boolean, nullable=True),
-        sa.Column('is_vegan', sa.Boolean, nullable=True),
-        sa.Column('is_gluten_free', sa.Boolean, nullable=True),
-        sa.Column('is_spicy', sa.Boolean, nullable=True),
-        sa.Column('spice_level', sa.Integer, nullable=True),
-        sa.Column('allergens', postgresql.ARRAY(sa.String), nullable=True),
-        sa.Column('calories', sa.Integer, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_menu_items_menu', 'menu_items', ['menu_id'])
-    op.create_index('idx_menu_items_name_trgm', 'menu_items', ['name'], postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
-    op.create_index('idx_menu_items_category', 'menu_items', ['category'])
-
-    # Extraction templates
-    op.create_table(
-        'extraction_templates',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('name', sa.String(255), nullable=False, unique=True),
-        sa.Column('document_type', document_type_enum, nullable=False),
-        sa.Column('description', sa.Text, nullable=True),
-        sa.Column('system_prompt', sa.Text, nullable=False),
-        sa.Column('extraction_schema', postgresql.JSONB, nullable=False),
-        sa.Column('validation_rules', postgresql.JSONB, nullable=True),
-        sa.Column('examples', postgresql.JSONB, nullable=True),
-        sa.Column('is_active', sa.Boolean, server_default='true'),
-        sa.Column('version', sa.Integer, server_default='1'),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.Column('created_by', sa.String(255), nullable=True),
-    )
-
-    # Webhook subscriptions
-    op.create_table(
-        'webhook_subscriptions',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('url', sa.String(2000), nullable=False),
-        sa.Column('secret', sa.String(255), nullable=False),
-        sa.Column('events', postgresql.ARRAY(sa.String), nullable=False),
-        sa.Column('is_active', sa.Boolean, server_default='true'),
-        sa.Column('max_retries', sa.Integer, server_default='3'),
-        sa.Column('retry_delay_seconds', sa.Integer, server_default='60'),
-        sa.Column('total_delivered', sa.Integer, server_default='0'),
-        sa.Column('total_failed', sa.Integer, server_default='0'),
-        sa.Column('last_delivery_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('last_failure_reason', sa.Text, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.Column('created_by', sa.String(255), nullable=True),
-    )
-
-    # Webhook deliveries
-    op.create_table(
-        'webhook_deliveries',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('subscription_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webhook_subscriptions.id'), nullable=False),
-        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id'), nullable=True),
-        sa.Column('event_type', sa.String(100), nullable=False),
-        sa.Column('payload', postgresql.JSONB, nullable=False),
-        sa.Column('status', sa.String(50), nullable=True),
-        sa.Column('attempts', sa.Integer, server_default='0'),
-        sa.Column('response_status_code', sa.Integer, nullable=True),
-        sa.Column('response_body', sa.Text, nullable=True),
-        sa.Column('error_message', sa.Text, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
-    )
-
-    # Audit log
-    op.create_table(
-        'audit_log',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
-        sa.Column('entity_type', sa.String(100), nullable=False),
-        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('action', sa.String(50), nullable=False),
-        sa.Column('actor', sa.String(255), nullable=True),
-        sa.Column('old_values', postgresql.JSONB, nullable=True),
-        sa.Column('new_values', postgresql.JSONB, nullable=True),
-        sa.Column('ip_address', postgresql.INET, nullable=True),
-        sa.Column('user_agent', sa.Text, nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
-    )
-
-    op.create_index('idx_audit_entity', 'audit_log', ['entity_type', 'entity_id'])
-    op.create_index('idx_audit_created', 'audit_log', ['created_at'], postgresql_ops={'created_at': 'DESC'})
+    _create_tables()
+    # Seed data (e.g. extraction_templates rows) belongs here, before the
+    # indexes exist, so bulk inserts do not pay per-row index maintenance
+    _create_indexes()
 
 
 def downgrade() -> None:
-    """Drop all tables and enums."""
+    """Drop all tables and supporting objects."""
     op.drop_table('audit_log')
     op.drop_table('webhook_deliveries')
     op.drop_table('webhook_subscriptions')
@@ -326,10 +449,9 @@ def downgrade() -> None:
     op.drop_table('invoices')
     op.drop_table('extractions')
     op.drop_table('documents')
+    op.execute('DROP FUNCTION IF EXISTS set_updated_at()')
+    op.execute('DROP FUNCTION IF EXISTS create_monthly_partitions(text, integer)')
 
-    op.execute('DROP TYPE IF EXISTS confidence_level')
-    op.execute('DROP TYPE IF EXISTS processing_status')
-    op.execute('DROP TYPE IF EXISTS document_type')
-    op.execute('DROP EXTENSION IF EXISTS pgvector')
+    op.execute('DROP EXTENSION IF EXISTS vector')
     op.execute('DROP EXTENSION IF EXISTS pg_trgm')
     op.execute('DROP EXTENSION IF EXISTS "uuid-ossp"')
@@ -11,12 +11,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 
 
 def create_file(relative_path: str, content: str) -> None:
-    """Create a file with given content."""
-    file_path = PROJECT_ROOT / relative_path
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(file_path, 'w') as f:
-        f.write(content)
+    """Create a file with given content. The parent directory must exist."""
+    (PROJECT_ROOT / relative_path).write_text(content)
 
     print(f"✓ Created {relative_path}")
 
@@ -43,6 +39,11 @@ def generate_all_files() -> None:
         "tests/integration/__init__.py",
     ]
 
+    # Create each package directory once, then write the files
+    parents = {(PROJECT_ROOT / init_file).parent for init_file in init_files}
+    for parent in parents:
+        parent.mkdir(parents=True, exist_ok=True)
+
     for init_file in init_files:
         create_file(init_file, '"""Package initialization."""\n')
 
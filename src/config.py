@@ -1,6 +1,6 @@
 """Application configuration management using pydantic-settings."""
 
-from functools import lru_cache
+import json
 from typing import Literal
 
 from pydantic import Field, field_validator
@@ -10,7 +10,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
-    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="allow")
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=True, extra="allow", frozen=True
+    )
 
     # Application
     APP_NAME: str = "Document Intelligence"
@@ -84,12 +86,9 @@ class Settings(BaseSettings):
     def parse_cors_origins(cls, v: str | list[str]) -> list[str]:
         """Parse CORS origins from string or list."""
         if isinstance(v, str):
-            import json
-
-            try:
+            if v.lstrip().startswith("["):
                 return json.loads(v)
-            except json.JSONDecodeError:
-                return [origin.strip() for origin in v.split(",")]
+            return [origin.strip() for origin in v.split(",")]
         return v
 
     @field_validator("ALLOWED_MIME_TYPES", mode="before")
@@ -97,21 +96,28 @@ class Settings(BaseSettings):
     def parse_allowed_mime_types(cls, v: str | list[str]) -> list[str]:
         """Parse allowed MIME types from string or list."""
         if isinstance(v, str):
-            import json
-
-            try:
+            if v.lstrip().startswith("["):
                 return json.loads(v)
-            except json.JSONDecodeError:
-                return [mime.strip() for mime in v.split(",")]
+            return [mime.strip() for mime in v.split(",")]
         return v
 
     @property
     def max_file_size_bytes(self) -> int:
-        """Get max file size in bytes."""
+        """
+        Get max file size in bytes.
+
+        Deliberately computed on each access: a value cached on the instance
+        would be carried over by model_copy(update=...) and go stale.
+        """
         return self.MAX_FILE_SIZE_MB * 1024 * 1024
 
 
-@lru_cache()
+_settings: Settings | None = None
+
+
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
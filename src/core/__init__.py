@@ -1,5 +1,6 @@
 """Core application logic and exceptions."""
 
+from src.core.enums import ConfidenceLevel, DocumentType, ProcessingStatus
 from src.core.exceptions import (
     CorruptedPDFError,
     DocumentIntelligenceError,
@@ -14,6 +15,9 @@ from src.core.exceptions import (
 )
 
 __all__ = [
+    "DocumentType",
+    "ProcessingStatus",
+    "ConfidenceLevel",
     "DocumentIntelligenceError",
     "ValidationError",
     "ProcessingError",
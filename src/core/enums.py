@@ -0,0 +1,35 @@
+"""Integer-coded enumerations stored as SMALLINT columns."""
+
+from enum import IntEnum
+
+
+class DocumentType(IntEnum):
+    """Detected document type (documents.document_type)."""
+
+    UNKNOWN = 0
+    INVOICE = 1
+    RECEIPT = 2
+    MENU = 3
+    FORM = 4
+    CONTRACT = 5
+
+
+class ProcessingStatus(IntEnum):
+    """Document processing status (documents.status)."""
+
+    PENDING = 0
+    PROCESSING = 1
+    EXTRACTING = 2
+    VALIDATING = 3
+    COMPLETED = 4
+    FAILED = 5
+    NEEDS_REVIEW = 6
+
+
+class ConfidenceLevel(IntEnum):
+    """Extraction confidence bucket (extractions.confidence_level)."""
+
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+    VERY_LOW = 3
@@ -2,7 +2,13 @@
 
 
 class DocumentIntelligenceError(Exception):
-    """Base exception for all document intelligence errors."""
+    """
+    Base exception for all document intelligence errors.
+
+    Subclasses with structured fields pass them as ``args`` and build their
+    message in ``__str__``, so raising and catching stays cheap when the
+    message is never rendered.
+    """
 
     pass
 
@@ -38,7 +44,10 @@ class FileSizeExceededError(ValidationError):
     def __init__(self, size_mb: float, max_mb: int) -> None:
         self.size_mb = size_mb
         self.max_mb = max_mb
-        super().__init__(f"File size {size_mb:.2f}MB exceeds maximum allowed {max_mb}MB")
+        super().__init__(size_mb, max_mb)
+
+    def __str__(self) -> str:
+        return f"File size {self.size_mb:.2f}MB exceeds maximum allowed {self.max_mb}MB"
 
 
 class UnsupportedFileTypeError(ValidationError):
@@ -47,8 +56,12 @@ class UnsupportedFileTypeError(ValidationError):
     def __init__(self, mime_type: str, allowed_types: list[str]) -> None:
         self.mime_type = mime_type
         self.allowed_types = allowed_types
-        super().__init__(
-            f"File type '{mime_type}' is not supported. Allowed types: {', '.join(allowed_types)}"
+        super().__init__(mime_type, allowed_types)
+
+    def __str__(self) -> str:
+        return (
+            f"File type '{self.mime_type}' is not supported. "
+            f"Allowed types: {', '.join(self.allowed_types)}"
         )
 
 
@@ -58,8 +71,12 @@ class DuplicateDocumentError(ValidationError):
     def __init__(self, file_hash: str, existing_document_id: str) -> None:
         self.file_hash = file_hash
         self.existing_document_id = existing_document_id
-        super().__init__(
-            f"Document with hash {file_hash} already exists (ID: {existing_document_id})"
+        super().__init__(file_hash, existing_document_id)
+
+    def __str__(self) -> str:
+        return (
+            f"Document with hash {self.file_hash} already exists "
+            f"(ID: {self.existing_document_id})"
         )
 
 
@@ -97,8 +114,11 @@ class TooManyPagesError(PDFProcessingError):
     def __init__(self, page_count: int, max_pages: int) -> None:
         self.page_count = page_count
         self.max_pages = max_pages
-        super().__init__(
-            f"PDF has {page_count} pages, exceeding maximum allowed {max_pages} pages"
+        super().__init__(page_count, max_pages)
+
+    def __str__(self) -> str:
+        return (
+            f"PDF has {self.page_count} pages, exceeding maximum allowed {self.max_pages} pages"
         )
 
 
@@ -114,7 +134,10 @@ class UnsupportedImageFormatError(ImageProcessingError):
 
     def __init__(self, format: str) -> None:
         self.format = format
-        super().__init__(f"Image format '{format}' is not supported")
+        super().__init__(format)
+
+    def __str__(self) -> str:
+        return f"Image format '{self.format}' is not supported"
 
 
 class ImageTooLargeError(ImageProcessingError):
@@ -124,8 +147,12 @@ class ImageTooLargeError(ImageProcessingError):
         self.width = width
         self.height = height
         self.max_dimension = max_dimension
-        super().__init__(
-            f"Image dimensions {width}x{height} exceed maximum dimension {max_dimension}px"
+        super().__init__(width, height, max_dimension)
+
+    def __str__(self) -> str:
+        return (
+            f"Image dimensions {self.width}x{self.height} "
+            f"exceed maximum dimension {self.max_dimension}px"
         )
 
 
@@ -135,7 +162,10 @@ class ModelTimeoutError(ExtractionError):
 
     def __init__(self, timeout_seconds: int) -> None:
         self.timeout_seconds = timeout_seconds
-        super().__init__(f"Model extraction timed out after {timeout_seconds} seconds")
+        super().__init__(timeout_seconds)
+
+    def __str__(self) -> str:
+        return f"Model extraction timed out after {self.timeout_seconds} seconds"
 
 
 class ModelAPIError(ExtractionError):
@@ -143,14 +173,22 @@ class ModelAPIError(ExtractionError):
 
     def __init__(self, provider: str, message: str) -> None:
         self.provider = provider
-        super().__init__(f"{provider} API error: {message}")
+        self.message = message
+        super().__init__(provider, message)
+
+    def __str__(self) -> str:
+        return f"{self.provider} API error: {self.message}"
 
 
 class InvalidExtractionResponseError(ExtractionError):
     """Raised when extraction response cannot be parsed."""
 
     def __init__(self, reason: str) -> None:
-        super().__init__(f"Invalid extraction response: {reason}")
+        self.reason = reason
+        super().__init__(reason)
+
+    def __str__(self) -> str:
+        return f"Invalid extraction response: {self.reason}"
 
 
 # Storage exceptions
@@ -159,14 +197,21 @@ class FileNotFoundError(StorageError):
 
     def __init__(self, path: str) -> None:
         self.path = path
-        super().__init__(f"File not found in storage: {path}")
+        super().__init__(path)
+
+    def __str__(self) -> str:
+        return f"File not found in storage: {self.path}"
 
 
 class StorageConnectionError(StorageError):
     """Raised when storage connection fails."""
 
     def __init__(self, message: str) -> None:
-        super().__init__(f"Storage connection error: {message}")
+        self.message = message
+        super().__init__(message)
+
+    def __str__(self) -> str:
+        return f"Storage connection error: {self.message}"
 
 
 # Database exceptions
@@ -182,7 +227,10 @@ class RecordNotFoundError(DatabaseError):
     def __init__(self, entity: str, identifier: str) -> None:
         self.entity = entity
         self.identifier = identifier
-        super().__init__(f"{entity} with identifier '{identifier}' not found")
+        super().__init__(entity, identifier)
+
+    def __str__(self) -> str:
+        return f"{self.entity} with identifier '{self.identifier}' not found"
 
 
 class RecordAlreadyExistsError(DatabaseError):
@@ -191,4 +239,7 @@ class RecordAlreadyExistsError(DatabaseError):
     def __init__(self, entity: str, identifier: str) -> None:
         self.entity = entity
         self.identifier = identifier
-        super().__init__(f"{entity} with identifier '{identifier}' already exists")
+        super().__init__(entity, identifier)
+
+    def __str__(self) -> str:
+        return f"{self.entity} with identifier '{self.identifier}' already exists"
@@ -1,17 +1,53 @@
 """Extraction prompts for different document types."""
 
+from src.extractors.prompts.classification import (
+    CLASSIFICATION_PROMPT,
+    CLASSIFICATION_PROMPT_BYTES,
+    CLASSIFICATION_PROMPT_SHA256,
+    DOCUMENT_TYPE_LABELS,
+)
 from src.extractors.prompts.invoice import (
+    CURRENCY_RE,
+    DATE_RE,
     INVOICE_EXTRACTION_PROMPT,
+    INVOICE_EXTRACTION_PROMPT_BYTES,
+    INVOICE_EXTRACTION_PROMPT_SHA256,
     INVOICE_FEW_SHOT_EXAMPLES,
+    INVOICE_SCHEMA,
+    INVOICE_SCHEMA_JSON,
+)
+from src.extractors.prompts.menu import (
+    MENU_EXTRACTION_PROMPT,
+    MENU_EXTRACTION_PROMPT_BYTES,
+    MENU_EXTRACTION_PROMPT_SHA256,
+)
+from src.extractors.prompts.receipt import (
+    RECEIPT_CATEGORIES,
+    RECEIPT_EXTRACTION_PROMPT,
+    RECEIPT_EXTRACTION_PROMPT_BYTES,
+    RECEIPT_EXTRACTION_PROMPT_SHA256,
+    TIME_RE,
 )
-from src.extractors.prompts.receipt import RECEIPT_EXTRACTION_PROMPT
-from src.extractors.prompts.menu import MENU_EXTRACTION_PROMPT
-from src.extractors.prompts.classification import CLASSIFICATION_PROMPT
 
 __all__ = [
     "CLASSIFICATION_PROMPT",
+    "CLASSIFICATION_PROMPT_BYTES",
+    "CLASSIFICATION_PROMPT_SHA256",
+    "CURRENCY_RE",
+    "DATE_RE",
+    "DOCUMENT_TYPE_LABELS",
     "INVOICE_EXTRACTION_PROMPT",
+    "INVOICE_EXTRACTION_PROMPT_BYTES",
+    "INVOICE_EXTRACTION_PROMPT_SHA256",
     "INVOICE_FEW_SHOT_EXAMPLES",
-    "RECEIPT_EXTRACTION_PROMPT",
+    "INVOICE_SCHEMA",
+    "INVOICE_SCHEMA_JSON",
     "MENU_EXTRACTION_PROMPT",
+    "MENU_EXTRACTION_PROMPT_BYTES",
+    "MENU_EXTRACTION_PROMPT_SHA256",
+    "RECEIPT_CATEGORIES",
+    "RECEIPT_EXTRACTION_PROMPT",
+    "RECEIPT_EXTRACTION_PROMPT_BYTES",
+    "RECEIPT_EXTRACTION_PROMPT_SHA256",
+    "TIME_RE",
 ]
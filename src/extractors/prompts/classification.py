@@ -1,5 +1,9 @@
 """Document classification prompt."""
 
+import hashlib
+
+from src.core.enums import DocumentType
+
 CLASSIFICATION_PROMPT = """Look at this document image and determine what type of document it is.
 
 Analyze the document carefully and identify its type based on layout, content, and common document patterns.
@@ -26,3 +30,9 @@ Important:
 - Use confidence score between 0.0 and 1.0
 - Provide clear reasoning for your classification
 """
+
+CLASSIFICATION_PROMPT_BYTES = CLASSIFICATION_PROMPT.encode("utf-8")
+CLASSIFICATION_PROMPT_SHA256 = hashlib.sha256(CLASSIFICATION_PROMPT_BYTES).digest()
+
+# Labels the prompt allows for "document_type"
+DOCUMENT_TYPE_LABELS = frozenset(doc_type.name.lower() for doc_type in DocumentType)
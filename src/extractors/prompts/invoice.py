@@ -1,6 +1,60 @@
 """Invoice extraction prompt and examples."""
 
-INVOICE_EXTRACTION_PROMPT = """You are a document extraction specialist. Analyze this invoice image and extract all relevant information into a structured format.
+import hashlib
+import re
+
+import orjson
+
+INVOICE_SCHEMA: dict = {
+    "invoice_number": "string or null",
+    "invoice_date": "YYYY-MM-DD or null",
+    "due_date": "YYYY-MM-DD or null",
+    "purchase_order_number": "string or null",
+    "vendor": {
+        "name": "string",
+        "address": "string or null",
+        "tax_id": "string or null",
+        "email": "string or null",
+        "phone": "string or null",
+    },
+    "customer": {
+        "name": "string or null",
+        "address": "string or null",
+        "account_number": "string or null",
+    },
+    "line_items": [
+        {
+            "line_number": 1,
+            "item_code": "string or null",
+            "description": "string",
+            "quantity": 1.0,
+            "unit": "string or null",
+            "unit_price": 0.00,
+            "discount_percent": 0.00,
+            "tax_percent": 0.00,
+            "line_total": 0.00,
+        }
+    ],
+    "subtotal": 0.00,
+    "tax_amount": 0.00,
+    "tax_rate": 0.00,
+    "discount_amount": 0.00,
+    "shipping_amount": 0.00,
+    "total_amount": 0.00,
+    "currency": "USD",
+    "payment_terms": "string or null",
+    "payment_method": "string or null",
+    "bank_account": "string or null",
+    "notes": "string or null",
+    "extraction_confidence": 0.95,
+    "warnings": ["List any issues or uncertainties"],
+}
+
+# Serialized once at import; extractors reuse these bytes instead of
+# re-serializing the schema per request
+INVOICE_SCHEMA_JSON = orjson.dumps(INVOICE_SCHEMA, option=orjson.OPT_INDENT_2)
+
+_INVOICE_PROMPT_HEADER = """You are a document extraction specialist. Analyze this invoice image and extract all relevant information into a structured format.
 
 Extract the following information:
 
@@ -52,60 +106,9 @@ For each item, extract:
 - Notes or comments
 
 Respond with a JSON object matching this exact schema:
-```json
-{
-    "invoice_number": "string or null",
-    "invoice_date": "YYYY-MM-DD or null",
-    "due_date": "YYYY-MM-DD or null",
-    "purchase_order_number": "string or null",
-
-    "vendor": {
-        "name": "string",
-        "address": "string or null",
-        "tax_id": "string or null",
-        "email": "string or null",
-        "phone": "string or null"
-    },
-
-    "customer": {
-        "name": "string or null",
-        "address": "string or null",
-        "account_number": "string or null"
-    },
-
-    "line_items": [
-        {
-            "line_number": 1,
-            "item_code": "string or null",
-            "description": "string",
-            "quantity": 1.0,
-            "unit": "string or null",
-            "unit_price": 0.00,
-            "discount_percent": 0.00,
-            "tax_percent": 0.00,
-            "line_total": 0.00
-        }
-    ],
-
-    "subtotal": 0.00,
-    "tax_amount": 0.00,
-    "tax_rate": 0.00,
-    "discount_amount": 0.00,
-    "shipping_amount": 0.00,
-    "total_amount": 0.00,
-    "currency": "USD",
-
-    "payment_terms": "string or null",
-    "payment_method": "string or null",
-    "bank_account": "string or null",
-
-    "notes": "string or null",
-
-    "extraction_confidence": 0.95,
-    "warnings": ["List any issues or uncertainties"]
-}
-```
+"""
 
+_INVOICE_PROMPT_FOOTER = """
 Important:
 - Use null for any fields you cannot find or are uncertain about
 - Ensure all monetary values are numbers, not strings
@@ -115,6 +118,20 @@ Important:
 - Verify that line items sum to subtotal (note discrepancy in warnings if not)
 """
 
+INVOICE_EXTRACTION_PROMPT_BYTES = (
+    _INVOICE_PROMPT_HEADER.encode("utf-8")
+    + b"```json\n"
+    + INVOICE_SCHEMA_JSON
+    + b"\n```\n"
+    + _INVOICE_PROMPT_FOOTER.encode("utf-8")
+)
+INVOICE_EXTRACTION_PROMPT = INVOICE_EXTRACTION_PROMPT_BYTES.decode("utf-8")
+INVOICE_EXTRACTION_PROMPT_SHA256 = hashlib.sha256(INVOICE_EXTRACTION_PROMPT_BYTES).digest()
+
+# Compiled once for validating model output against the formats requested above
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\Z")
+CURRENCY_RE = re.compile(r"^[A-Z]{3}\Z")
+
 INVOICE_FEW_SHOT_EXAMPLES = [
     {
         "description": "Standard commercial invoice",
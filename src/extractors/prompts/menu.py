@@ -1,5 +1,7 @@
 """Menu extraction prompt."""
 
+import hashlib
+
 MENU_EXTRACTION_PROMPT = """You are analyzing a restaurant menu image. Extract all menu items with details.
 
 ## Restaurant Information
@@ -62,3 +64,6 @@ Important:
 - Handle market price items (price = null, note in description)
 - Look for dietary symbols and indicators
 """
+
+MENU_EXTRACTION_PROMPT_BYTES = MENU_EXTRACTION_PROMPT.encode("utf-8")
+MENU_EXTRACTION_PROMPT_SHA256 = hashlib.sha256(MENU_EXTRACTION_PROMPT_BYTES).digest()
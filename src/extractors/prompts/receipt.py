@@ -1,5 +1,8 @@
 """Receipt extraction prompt."""
 
+import hashlib
+import re
+
 RECEIPT_EXTRACTION_PROMPT = """You are analyzing a receipt image. Extract all information into a structured format.
 
 ## Merchant Information
@@ -85,3 +88,21 @@ Important:
 - Identify payment method from receipt details
 - Choose most appropriate category
 """
+
+RECEIPT_EXTRACTION_PROMPT_BYTES = RECEIPT_EXTRACTION_PROMPT.encode("utf-8")
+RECEIPT_EXTRACTION_PROMPT_SHA256 = hashlib.sha256(RECEIPT_EXTRACTION_PROMPT_BYTES).digest()
+
+TIME_RE = re.compile(r"^\d{2}:\d{2}:\d{2}\Z")
+RECEIPT_CATEGORIES = frozenset(
+    {
+        "food_dining",
+        "grocery",
+        "retail",
+        "travel",
+        "entertainment",
+        "services",
+        "healthcare",
+        "fuel",
+        "other",
+    }
+)
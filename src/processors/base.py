@@ -1,26 +1,27 @@
 """Base processor interface for document processing."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedPage:
     """Represents a single processed page from a document."""
 
     page_number: int
-    image_bytes: bytes
-    image_format: str  # jpeg, png
+    image_bytes: bytes | None  # None if the page was not rasterized
+    image_format: str | None  # jpeg, png
     width: int
     height: int
     dpi: int
     text_content: str | None = None  # OCR or extracted text
     is_scanned: bool = False  # True if image-based (needs OCR)
-    metadata: dict = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedDocument:
     """Represents a fully processed document with all pages."""
 
@@ -29,7 +30,7 @@ class ProcessedDocument:
     file_hash: str
     total_pages: int
     pages: list[ProcessedPage]
-    metadata: dict = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
     processing_time_ms: int = 0
 
 
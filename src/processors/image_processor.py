@@ -1,21 +1,75 @@
 """Image document processor with preprocessing capabilities."""
 
+import asyncio
 import io
 import time
-from typing import BinaryIO
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any, BinaryIO, TypeVar
 
 import cv2
 import numpy as np
+import pyvips
 from PIL import Image, ImageEnhance
 from PIL.ExifTags import TAGS
+from PIL.TiffImagePlugin import IFDRational
 
 from src.core.exceptions import ImageProcessingError, UnsupportedImageFormatError
 from src.processors.base import BaseProcessor, ProcessedDocument, ProcessedPage
-from src.utils.hashing import calculate_file_hash
+from src.utils.hashing import DEDUP_HASH_ALGORITHM, calculate_bytes_hash
+from src.utils.jpeg import encode_jpeg
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_T = TypeVar("_T")
+
+EXIF_ORIENTATION_TAG = 274
+
+# Counter-clockwise rotation in degrees, indexed by EXIF orientation value
+EXIF_ROTATION_DEGREES = (0, 0, 0, 180, 0, 0, 270, 0, 90)
+
+
+class DenoiseStrategy(StrEnum):
+    """Denoising filter, from cheapest to most thorough."""
+
+    FAST = "fast"  # 3x3 median blur; enough to clean JPEG artifacts
+    BILATERAL = "bilateral"  # Edge-preserving; removes scanner grain
+    NLM = "nlm"  # Non-local means; slowest, strongest
+
+
+def _decode_exif_bytes(value: bytes) -> str:
+    """Decode an EXIF byte string, falling back to Latin-1 for non-UTF-8 data."""
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        # Latin-1 maps every byte, so this cannot fail
+        return value.decode("latin-1")
+
+
+def _exif_value(value: Any) -> Any:
+    """Convert an EXIF value, including nested tuples and IFDs, to JSON types."""
+    if isinstance(value, bytes):
+        return _decode_exif_bytes(value)
+    if isinstance(value, IFDRational):
+        return float(value)
+    if isinstance(value, (tuple, list)):
+        return [_exif_value(item) for item in value]
+    if isinstance(value, dict):
+        # Nested IFDs (e.g. GPS) have their own tag tables; keep their IDs
+        return {str(key): _exif_value(item) for key, item in value.items()}
+    return value
+
+
+def _materialize_exif(exif: Image.Exif) -> dict[str, Any]:
+    """Decode EXIF tags into a JSON-serializable dict keyed by tag name."""
+    try:
+        # Unknown tags are keyed by their numeric ID, as a string
+        return {str(TAGS.get(tag_id, tag_id)): _exif_value(value) for tag_id, value in exif.items()}
+    except Exception as e:
+        logger.debug("exif_extraction_failed", error=str(e))
+        return {}
+
 
 class ImageProcessor(BaseProcessor):
     """Processor for image documents (JPEG, PNG, WebP, TIFF)."""
@@ -26,6 +80,8 @@ class ImageProcessor(BaseProcessor):
         "image/webp",
         "image/tiff",
     ]
+    DESKEW_DETECTION_SIZE = 800  # Longest side of the skew-detection thumbnail
+    DESKEW_PROFILE_MAX_POINTS = 20_000  # Foreground pixels sampled for the projection profile
 
     def __init__(
         self,
@@ -34,7 +90,7 @@ class ImageProcessor(BaseProcessor):
         auto_rotate: bool = True,
         deskew: bool = True,
         enhance_contrast: bool = False,
-        denoise: bool = False,
+        denoise: DenoiseStrategy | str | bool = False,
         jpeg_quality: int = 85,
     ):
         """
@@ -46,7 +102,8 @@ class ImageProcessor(BaseProcessor):
             auto_rotate: Apply EXIF rotation
             deskew: Correct slight rotations
             enhance_contrast: Apply contrast enhancement
-            denoise: Apply denoising
+            denoise: Denoising strategy, True for the bilateral default, or
+                False to disable denoising
             jpeg_quality: JPEG compression quality
         """
         self.max_dimension = max_dimension
@@ -54,9 +111,20 @@ class ImageProcessor(BaseProcessor):
         self.auto_rotate = auto_rotate
         self.deskew = deskew
         self.enhance_contrast = enhance_contrast
-        self.denoise = denoise
+        self.denoise = self._resolve_denoise_strategy(denoise)
         self.jpeg_quality = jpeg_quality
 
+    @staticmethod
+    def _resolve_denoise_strategy(
+        denoise: DenoiseStrategy | str | bool,
+    ) -> DenoiseStrategy | None:
+        """Normalize the denoise option to a strategy, or None when disabled."""
+        if denoise is True:
+            return DenoiseStrategy.BILATERAL
+        if not denoise:
+            return None
+        return DenoiseStrategy(denoise)
+
     def supports(self, mime_type: str) -> bool:
         """Check if image MIME type is supported."""
         return mime_type in self.SUPPORTED_MIME_TYPES
@@ -84,8 +152,8 @@ class ImageProcessor(BaseProcessor):
         image_bytes = file.read()
         file.seek(0)
 
-        # Calculate file hash
-        file_hash = calculate_file_hash(file)
+        # Hash the bytes already in memory rather than reading the file again
+        file_hash = calculate_bytes_hash(image_bytes, DEDUP_HASH_ALGORITHM)
 
         # Load image with PIL
         try:
@@ -94,8 +162,8 @@ class ImageProcessor(BaseProcessor):
             logger.error("image_load_failed", filename=filename, error=str(e))
             raise ImageProcessingError(f"Failed to load image: {str(e)}")
 
-        # Extract EXIF metadata
-        metadata = self._extract_exif(image)
+        # Read the EXIF directory once; the pipeline only needs the orientation
+        exif = self._read_exif(image)
         original_format = image.format
 
         if not original_format:
@@ -109,44 +177,45 @@ class ImageProcessor(BaseProcessor):
             mode=image.mode,
         )
 
-        # Apply auto-rotation based on EXIF
-        if self.auto_rotate:
-            image = self._apply_exif_rotation(image)
-
-        # Convert to RGB
-        if image.mode not in ("RGB", "L"):
-            logger.debug("converting_to_rgb", original_mode=image.mode)
-            if image.mode == "RGBA":
-                # Create white background for transparent images
-                background = Image.new("RGB", image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[3])
-                image = background
-            else:
-                image = image.convert("RGB")
-
-        # Apply preprocessing
+        # Decoding, preprocessing and encoding run in worker threads; PIL,
+        # OpenCV and libvips release the GIL for the heavy lifting
         if self.deskew or self.enhance_contrast or self.denoise:
-            image = await self._preprocess_image(image)
-
-        # Resize if needed
-        image = self._resize_image(image)
-
-        # Optimize and convert to bytes
-        optimized_bytes, output_format = self._optimize_image(image)
+            optimized_bytes, output_format, width, height = await asyncio.to_thread(
+                self._process_with_pil, image, exif
+            )
+        elif self._can_pass_through(image, exif):
+            # Already a JPEG within bounds; skip the decode/re-encode round-trip
+            logger.debug("jpeg_passthrough", filename=filename)
+            optimized_bytes, output_format = image_bytes, "jpeg"
+            width, height = image.size
+        else:
+            # Without pixel-level preprocessing the whole chain can run in libvips
+            try:
+                optimized_bytes, output_format, width, height = await asyncio.to_thread(
+                    self._process_with_vips, image_bytes
+                )
+            except pyvips.Error as e:
+                logger.warning("vips_pipeline_failed", filename=filename, error=str(e))
+                optimized_bytes, output_format, width, height = await asyncio.to_thread(
+                    self._process_with_pil, image, exif
+                )
+
+        # Decode the remaining tags only if there are any
+        exif_metadata = _materialize_exif(exif) if exif else {}
 
         # Create ProcessedPage
         processed_page = ProcessedPage(
             page_number=1,
             image_bytes=optimized_bytes,
             image_format=output_format,
-            width=image.width,
-            height=image.height,
+            width=width,
+            height=height,
             dpi=self.target_dpi,
             text_content=None,  # Will be filled by OCR if needed
             is_scanned=True,  # Images are always considered scanned
             metadata={
                 "original_format": original_format,
-                "exif": metadata,
+                "exif": exif_metadata,
             },
         )
 
@@ -167,74 +236,157 @@ class ImageProcessor(BaseProcessor):
             file_hash=file_hash,
             total_pages=1,
             pages=[processed_page],
-            metadata=metadata,
+            metadata=exif_metadata,
             processing_time_ms=processing_time_ms,
         )
 
-    def _extract_exif(self, image: Image.Image) -> dict:
-        """Extract EXIF metadata from image."""
-        metadata = {}
+    def _can_pass_through(self, image: Image.Image, exif: Image.Exif) -> bool:
+        """Check whether the original bytes can be used without re-encoding."""
+        # Every other path strips metadata, so only metadata-free JPEGs pass
+        # through; this also rules out a non-default Orientation tag, which
+        # would make consumers rotate an image the other paths leave as-is
+        return (
+            image.format == "JPEG"
+            and image.mode in ("RGB", "L")
+            and max(image.size) <= self.max_dimension
+            and not exif
+            and "xmp" not in image.info
+        )
+
+    def _process_with_pil(
+        self, image: Image.Image, exif: Image.Exif
+    ) -> tuple[bytes, str, int, int]:
+        """
+        Rotate, normalize, preprocess, resize and encode an image with PIL/OpenCV.
+
+        Returns:
+            Tuple of (optimized_image_bytes, format, width, height)
+        """
+        # Apply auto-rotation based on EXIF
+        if self.auto_rotate:
+            image = self._apply_exif_rotation(image, self._get_orientation(exif))
+
+        # Convert to RGB
+        if image.mode not in ("RGB", "L"):
+            logger.debug("converting_to_rgb", original_mode=image.mode)
+            if image.mode == "RGBA":
+                # Create white background for transparent images
+                image = self._flatten_alpha(image)
+            else:
+                image = image.convert("RGB")
+
+        # Apply preprocessing
+        if self.deskew or self.enhance_contrast or self.denoise:
+            image = self._preprocess_image(image)
 
+        # Resize if needed
+        image = self._resize_image(image)
+
+        # Optimize and convert to bytes
+        optimized_bytes, output_format = self._optimize_image(image)
+        return optimized_bytes, output_format, image.width, image.height
+
+    def _process_with_vips(self, image_bytes: bytes) -> tuple[bytes, str, int, int]:
+        """
+        Rotate, normalize, resize and encode an image in one libvips pipeline.
+
+        libvips streams pixels through the chain without materializing
+        full-resolution intermediates, and shrinks JPEGs during decode.
+
+        Returns:
+            Tuple of (optimized_image_bytes, format, width, height)
+        """
+        image = pyvips.Image.thumbnail_buffer(
+            image_bytes,
+            self.max_dimension,
+            height=self.max_dimension,
+            size="down",
+            no_rotate=not self.auto_rotate,
+        )
+
+        if image.interpretation not in ("srgb", "b-w"):
+            image = image.colourspace("srgb")
+
+        # White background for transparent images
+        if image.hasalpha():
+            image = image.flatten(background=255)
+
+        optimized_bytes = image.jpegsave_buffer(
+            Q=self.jpeg_quality, optimize_coding=True, strip=True
+        )
+        return optimized_bytes, "jpeg", image.width, image.height
+
+    def _read_exif(self, image: Image.Image) -> Image.Exif:
+        """Read the EXIF directory without decoding individual tags."""
         try:
-            exif = image.getexif()
-            if exif:
-                for tag_id, value in exif.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    # Convert bytes to string if needed
-                    if isinstance(value, bytes):
-                        try:
-                            value = value.decode()
-                        except:
-                            value = str(value)
-                    metadata[tag] = value
+            return image.getexif()
         except Exception as e:
             logger.debug("exif_extraction_failed", error=str(e))
+            return Image.Exif()
 
-        return metadata
+    def _get_orientation(self, exif: Image.Exif) -> int | None:
+        """Get the EXIF orientation tag, if present."""
+        return exif.get(EXIF_ORIENTATION_TAG)
 
-    def _apply_exif_rotation(self, image: Image.Image) -> Image.Image:
+    def _apply_exif_rotation(self, image: Image.Image, orientation: int | None) -> Image.Image:
         """Apply EXIF orientation rotation."""
-        try:
-            exif = image.getexif()
-            orientation = exif.get(274)  # Orientation tag
-
-            if orientation:
-                rotation_map = {
-                    3: 180,
-                    6: 270,
-                    8: 90,
-                }
-                if orientation in rotation_map:
-                    degrees = rotation_map[orientation]
-                    logger.debug("rotating_image", degrees=degrees)
-                    image = image.rotate(degrees, expand=True)
-        except Exception as e:
-            logger.debug("exif_rotation_failed", error=str(e))
+        if not isinstance(orientation, int) or not 0 <= orientation < len(EXIF_ROTATION_DEGREES):
+            return image
+
+        degrees = EXIF_ROTATION_DEGREES[orientation]
+        if degrees:
+            logger.debug("rotating_image", degrees=degrees)
+            image = image.rotate(degrees, expand=True)
 
         return image
 
-    async def _preprocess_image(self, image: Image.Image) -> Image.Image:
+    def _flatten_alpha(self, image: Image.Image) -> Image.Image:
+        """Composite an RGBA image onto a white background in one pass."""
+        arr = np.asarray(image, dtype=np.uint8)
+        rgb = arr[..., :3].astype(np.uint16)
+        alpha = arr[..., 3:4].astype(np.uint16)
+
+        # Integer blend with rounding; the intermediate fits in uint16
+        blended = (rgb * alpha + 255 * (255 - alpha) + 127) // 255
+        return Image.fromarray(blended.astype(np.uint8))
+
+    def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """Apply preprocessing to enhance image quality."""
-        # Convert PIL Image to OpenCV format
-        img_array = np.array(image)
+        if not (self.deskew or self.denoise or self.enhance_contrast):
+            return image
 
-        if self.deskew:
-            img_array = self._deskew_image(img_array)
+        # Only round-trip through OpenCV when an OpenCV step is enabled
+        if self.deskew or self.denoise:
+            img_array = np.array(image)
 
-        if self.denoise:
-            img_array = self._denoise_image(img_array)
+            if self.deskew:
+                img_array = self._run_step(self._deskew_image, img_array, "deskew_failed")
 
-        # Convert back to PIL Image
-        image = Image.fromarray(img_array)
+            if self.denoise:
+                img_array = self._run_step(self._denoise_image, img_array, "denoise_failed")
+
+            image = Image.fromarray(img_array)
 
         if self.enhance_contrast:
-            image = self._enhance_contrast(image)
+            image = self._run_step(self._enhance_contrast, image, "contrast_enhancement_failed")
 
         return image
 
+    @staticmethod
+    def _run_step(step: Callable[[_T], _T], data: _T, failure_event: str) -> _T:
+        """Run one preprocessing step, keeping the input if the step fails."""
+        try:
+            return step(data)
+        except Exception as e:
+            logger.debug(failure_event, error=str(e))
+            return data
+
     def _deskew_image(self, img_array: np.ndarray) -> np.ndarray:
         """
-        Deskew image using Hough line transform.
+        Deskew image using the minimum-area rectangle of its foreground.
+
+        The skew angle is estimated on a downscaled binary thumbnail; only the
+        final rotation runs at full resolution.
 
         Args:
             img_array: Image as numpy array
@@ -242,70 +394,114 @@ class ImageProcessor(BaseProcessor):
         Returns:
             Deskewed image array
         """
-        try:
-            # Convert to grayscale for processing
-            if len(img_array.shape) == 3:
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = img_array
-
-            # Apply edge detection
-            edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-
-            # Detect lines using Hough transform
-            lines = cv2.HoughLines(edges, 1, np.pi / 180, 200)
-
-            if lines is not None and len(lines) > 0:
-                # Calculate median angle
-                angles = []
-                for rho, theta in lines[:, 0]:
-                    angle = np.degrees(theta) - 90
-                    angles.append(angle)
-
-                median_angle = np.median(angles)
-
-                # Only deskew if angle is small (< 10 degrees)
-                if abs(median_angle) < 10 and abs(median_angle) > 0.5:
-                    logger.debug("deskewing_image", angle=median_angle)
-                    # Get image dimensions
-                    (h, w) = img_array.shape[:2]
-                    center = (w // 2, h // 2)
-
-                    # Perform rotation
-                    M = cv2.getRotationMatrix2D(center, median_angle, 1.0)
-                    img_array = cv2.warpAffine(
-                        img_array,
-                        M,
-                        (w, h),
-                        flags=cv2.INTER_CUBIC,
-                        borderMode=cv2.BORDER_REPLICATE,
-                    )
-        except Exception as e:
-            logger.debug("deskew_failed", error=str(e))
+        # Convert to grayscale for processing
+        if len(img_array.shape) == 3:
+            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = img_array
+
+        # Estimate skew on a thumbnail
+        scale = self.DESKEW_DETECTION_SIZE / max(gray.shape[:2])
+        if scale < 1:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        # Dark text on light background becomes the foreground
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+
+        # The bounding rectangle is only meaningful for sparse foreground;
+        # dense or near-empty pages fall back to the projection profile
+        foreground_ratio = cv2.countNonZero(binary) / binary.size
+        if 0.01 <= foreground_ratio <= 0.3:
+            angle = self._min_area_rect_angle(binary)
+        else:
+            angle = self._projection_profile_angle(binary)
+
+        # Only deskew if angle is small (< 10 degrees)
+        if abs(angle) < 10 and abs(angle) > 0.5:
+            logger.debug("deskewing_image", angle=angle)
+            # Get image dimensions
+            (h, w) = img_array.shape[:2]
+            center = (w // 2, h // 2)
+
+            # Perform rotation
+            M = cv2.getRotationMatrix2D(center, angle, 1.0)
+            img_array = cv2.warpAffine(
+                img_array,
+                M,
+                (w, h),
+                flags=cv2.INTER_CUBIC,
+                borderMode=cv2.BORDER_REPLICATE,
+            )
 
         return img_array
 
+    @staticmethod
+    def _min_area_rect_angle(binary: np.ndarray) -> float:
+        """Get the rotation that aligns the foreground's bounding rectangle."""
+        coords = cv2.findNonZero(binary)
+        if coords is None:
+            return 0.0
+
+        # OpenCV versions disagree on whether the angle is in [0, 90) or
+        # (-90, 0]; folding modulo 90 into [-45, 45) works for either
+        angle = cv2.minAreaRect(coords)[2]
+        return float((angle + 45) % 90 - 45)
+
+    @classmethod
+    def _projection_profile_angle(cls, binary: np.ndarray) -> float:
+        """
+        Get the rotation that maximizes the variance of row sums.
+
+        Instead of warping the image once per candidate angle, the foreground
+        pixel coordinates are rotated for all angles at once and binned into
+        rows with a single bincount.
+        """
+        (h, w) = binary.shape[:2]
+        ys, xs = np.nonzero(binary)
+        if xs.size == 0:
+            return 0.0
+
+        # A uniform subsample keeps the (angles x points) matrix small on
+        # dense pages without changing which profile is sharpest
+        step = -(-xs.size // cls.DESKEW_PROFILE_MAX_POINTS)
+        xs = (xs[::step] - w // 2).astype(np.float32)
+        ys = (ys[::step] - h // 2).astype(np.float32)
+
+        angles = np.arange(-5.0, 5.5, 0.5)
+        theta = np.radians(angles, dtype=np.float32)[:, np.newaxis]
+
+        # Destination row of each point, matching cv2.getRotationMatrix2D
+        rows = np.rint(np.cos(theta) * ys - np.sin(theta) * xs).astype(np.intp) + h // 2
+
+        # Offset each angle into its own block of h bins; out-of-frame
+        # points go to a trailing overflow bin that is discarded
+        n_bins = len(angles) * h
+        bins = rows + np.arange(len(angles))[:, np.newaxis] * h
+        bins[(rows < 0) | (rows >= h)] = n_bins
+        profiles = np.bincount(bins.ravel(), minlength=n_bins + 1)[:n_bins]
+
+        scores = profiles.reshape(len(angles), h).var(axis=1)
+        return float(angles[int(np.argmax(scores))])
+
     def _denoise_image(self, img_array: np.ndarray) -> np.ndarray:
-        """Apply denoising to image."""
-        try:
-            if len(img_array.shape) == 3:
-                img_array = cv2.fastNlMeansDenoisingColored(img_array, None, 10, 10, 7, 21)
-            else:
-                img_array = cv2.fastNlMeansDenoising(img_array, None, 10, 7, 21)
-            logger.debug("denoising_applied")
-        except Exception as e:
-            logger.debug("denoise_failed", error=str(e))
+        """Apply the configured denoising strategy to image."""
+        if self.denoise is DenoiseStrategy.FAST:
+            img_array = cv2.medianBlur(img_array, 3)
+        elif self.denoise is DenoiseStrategy.BILATERAL:
+            img_array = cv2.bilateralFilter(img_array, 5, 35, 35)
+        elif len(img_array.shape) == 3:
+            img_array = cv2.fastNlMeansDenoisingColored(img_array, None, 10, 10, 7, 21)
+        else:
+            img_array = cv2.fastNlMeansDenoising(img_array, None, 10, 7, 21)
+        logger.debug("denoising_applied", strategy=self.denoise)
 
         return img_array
 
     def _enhance_contrast(self, image: Image.Image) -> Image.Image:
         """Enhance contrast using PIL."""
-        try:
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.5)  # Increase contrast by 50%
-            logger.debug("contrast_enhanced")
-        except Exception as e:
-            logger.debug("contrast_enhancement_failed", error=str(e))
+        enhancer = ImageEnhance.Contrast(image)
+        image = enhancer.enhance(1.5)  # Increase contrast by 50%
+        logger.debug("contrast_enhanced")
 
         return image
 
@@ -318,7 +514,12 @@ class ImageProcessor(BaseProcessor):
             scale = self.max_dimension / max_dim
             new_width = int(width * scale)
             new_height = int(height * scale)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # INTER_AREA is the right filter for downscaling and runs in
+            # OpenCV's vectorized resamplers
+            resized = cv2.resize(
+                np.asarray(image), (new_width, new_height), interpolation=cv2.INTER_AREA
+            )
+            image = Image.fromarray(resized)
             logger.debug(
                 "image_resized",
                 original_size=(width, height),
@@ -329,12 +530,8 @@ class ImageProcessor(BaseProcessor):
 
     def _optimize_image(self, image: Image.Image) -> tuple[bytes, str]:
         """Optimize image for storage and API transmission."""
-        buffer = io.BytesIO()
-
         # Always use JPEG for processed images to reduce size
-        image.save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
-
-        return buffer.getvalue(), "jpeg"
+        return encode_jpeg(image, self.jpeg_quality), "jpeg"
 
     def _get_mime_type(self, image_format: str) -> str:
         """Get MIME type from image format."""
@@ -1,7 +1,52 @@
 """File hashing utilities for deduplication."""
 
 import hashlib
-from typing import BinaryIO
+import io
+import mmap
+import tempfile
+from typing import Any, BinaryIO
+
+import blake3
+from typing_extensions import Buffer
+
+# Used for upload deduplication, where speed matters and no cryptographic
+# guarantees are needed; every other caller keeps the sha256 default
+DEDUP_HASH_ALGORITHM = "blake3"
+
+# Read size for streaming file hashes; also the input size above which
+# BLAKE3 hashes with multiple threads
+CHUNK_SIZE = 1 << 20
+
+
+def _new_hash(algorithm: str, size_hint: int) -> Any:
+    """Create a hash object, using BLAKE3's thread pool for large inputs."""
+    if algorithm == "blake3":
+        max_threads = blake3.blake3.AUTO if size_hint >= CHUNK_SIZE else 1
+        return blake3.blake3(max_threads=max_threads)
+    return hashlib.new(algorithm)
+
+
+def _update_from_file(hash_obj: Any, file: BinaryIO) -> None:
+    """Feed a whole file to a hash object in as few Python-level calls as possible."""
+    # In-memory files are hashed straight from their buffer
+    if isinstance(file, io.BytesIO):
+        with file.getbuffer() as view:
+            hash_obj.update(view)
+        return
+
+    # Real files are memory-mapped and hashed in one call; fileno() on a
+    # SpooledTemporaryFile would force it to disk, so those are streamed
+    if not isinstance(file, tempfile.SpooledTemporaryFile):
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hash_obj.update(mapped)
+            return
+        except (AttributeError, OSError, ValueError):
+            pass  # No file descriptor, not mappable, or empty
+
+    # Read file in chunks to handle large files efficiently
+    while chunk := file.read(CHUNK_SIZE):
+        hash_obj.update(chunk)
 
 
 def calculate_file_hash(file: BinaryIO, algorithm: str = "sha256") -> str:
@@ -15,29 +60,28 @@ def calculate_file_hash(file: BinaryIO, algorithm: str = "sha256") -> str:
     Returns:
         Hexadecimal hash string
     """
-    hash_obj = hashlib.new(algorithm)
+    size = file.seek(0, io.SEEK_END)
+    hash_obj = _new_hash(algorithm, size)
     file.seek(0)
-
-    # Read file in chunks to handle large files efficiently
-    chunk_size = 8192
-    while chunk := file.read(chunk_size):
-        hash_obj.update(chunk)
-
+    _update_from_file(hash_obj, file)
     file.seek(0)  # Reset file pointer
-    return hash_obj.hexdigest()
+    digest: str = hash_obj.hexdigest()
+    return digest
 
 
-def calculate_bytes_hash(data: bytes, algorithm: str = "sha256") -> str:
+def calculate_bytes_hash(data: Buffer, algorithm: str = "sha256") -> str:
     """
     Calculate hash of bytes.
 
     Args:
-        data: Bytes to hash
+        data: Bytes or any bytes-like buffer to hash
         algorithm: Hash algorithm to use (default: sha256)
 
     Returns:
         Hexadecimal hash string
     """
-    hash_obj = hashlib.new(algorithm)
-    hash_obj.update(data)
-    return hash_obj.hexdigest()
+    with memoryview(data) as view:
+        hash_obj = _new_hash(algorithm, view.nbytes)
+        hash_obj.update(view)
+    digest: str = hash_obj.hexdigest()
+    return digest
@@ -0,0 +1,98 @@
+"""JPEG encoding backed by libjpeg-turbo, with a PIL fallback."""
+
+import io
+from functools import cache
+
+import numpy as np
+from PIL import Image
+from turbojpeg import (
+    TJPF_GRAY,
+    TJPF_RGB,
+    TJSAMP_420,
+    TJSAMP_422,
+    TJSAMP_444,
+    TJSAMP_GRAY,
+    TurboJPEG,
+)
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# PIL's subsampling values for the TJSAMP_* constants it supports
+PIL_SUBSAMPLING = {TJSAMP_444: 0, TJSAMP_422: 1, TJSAMP_420: 2}
+
+
+@cache
+def _get_turbojpeg() -> TurboJPEG | None:
+    """
+    Get the shared libjpeg-turbo handle, or None if the library is missing.
+
+    The handle is created on first use rather than at import, so hosts
+    without libjpeg-turbo can still import the processors. encode() allocates
+    its own compressor per call, so one handle is shared.
+    """
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logger.warning("turbojpeg_unavailable", error=str(e))
+        return None
+
+
+def encode_jpeg(
+    image: Image.Image | np.ndarray, quality: int, subsample: int = TJSAMP_420
+) -> bytes:
+    """
+    Encode an RGB or grayscale image to JPEG.
+
+    Args:
+        image: RGB or grayscale PIL image, or the equivalent uint8 array
+        quality: JPEG quality (1-100)
+        subsample: Chroma subsampling for color images (TJSAMP_* constant)
+
+    Returns:
+        JPEG-encoded bytes
+    """
+    pixels = np.asarray(image)
+    turbojpeg = _get_turbojpeg()
+
+    if turbojpeg is None:
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(
+            buffer,
+            format="JPEG",
+            quality=quality,
+            subsampling=PIL_SUBSAMPLING.get(subsample, 2),
+        )
+        return buffer.getvalue()
+
+    encoded: bytes
+    if pixels.ndim == 2:
+        encoded = turbojpeg.encode(
+            pixels, quality=quality, pixel_format=TJPF_GRAY, jpeg_subsample=TJSAMP_GRAY
+        )
+    else:
+        encoded = turbojpeg.encode(
+            pixels, quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=subsample
+        )
+    return encoded
+
+
+def jpeg_size(data: bytes) -> tuple[int, int]:
+    """
+    Read a JPEG's dimensions from its header without decoding it.
+
+    Args:
+        data: JPEG-encoded bytes
+
+    Returns:
+        Tuple of (width, height)
+    """
+    turbojpeg = _get_turbojpeg()
+    if turbojpeg is None:
+        return Image.open(io.BytesIO(data)).size
+
+    width: int
+    height: int
+    width, height, _, _ = turbojpeg.decode_header(data)
+    return width, height
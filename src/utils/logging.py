@@ -5,41 +5,48 @@ import sys
 from typing import Any
 
 import structlog
-from structlog.types import EventDict, Processor
+from structlog.typing import EventDict, FilteringBoundLogger, Processor
 
 from src.config import get_settings
 
+# Filled once by configure_logging(); settings are immutable after load
+_app_context: dict[str, str] = {}
 
-def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Add application context to log events."""
-    settings = get_settings()
-    event_dict["app"] = settings.APP_NAME
-    event_dict["version"] = settings.APP_VERSION
+# Method names whose level is reported under the stdlib name
+_LEVEL_ALIASES = {"warn": "warning", "exception": "error"}
+
+
+def add_event_fields(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """Add logger name, log level and application context in a single pass."""
+    event_dict["logger"] = logger.name
+    event_dict["level"] = _LEVEL_ALIASES.get(method_name, method_name)
+    event_dict.update(_app_context)
     return event_dict
 
 
 def configure_logging() -> None:
     """Configure structured logging for the application."""
     settings = get_settings()
+    level = getattr(logging, settings.LOG_LEVEL)
+
+    _app_context.update(app=settings.APP_NAME, version=settings.APP_VERSION)
 
     # Configure standard logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL),
+        level=level,
     )
 
-    # Configure structlog processors
+    # Configure structlog processors; level filtering happens in the wrapper
+    # class, before any event dict is built, and the wrapper also applies
+    # positional arguments itself, so no formatter step is needed
     processors: list[Processor] = [
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        add_event_fields,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        add_app_context,
     ]
 
     # Add different renderer based on debug mode
@@ -50,13 +57,13 @@ def configure_logging() -> None:
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str) -> FilteringBoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)
@@ -1,6 +1,24 @@
-"""Prometheus metrics for monitoring."""
+"""
+Prometheus metrics for monitoring.
+
+Resolving a labelled child with ``metric.labels(...)`` validates the values,
+takes a lock and does a dict lookup on every call. Hot paths should resolve
+the child once, either at setup time::
+
+    upload_duration = api_request_duration_seconds.labels("POST", "/documents")
+    ...
+    upload_duration.observe(elapsed)
+
+or through ``bound()`` when the label values are only known per call. Use
+``remove_labels()``/``clear_labels()`` rather than ``metric.remove()``/
+``metric.clear()``, so ``bound()`` does not keep handing out children that
+are no longer registered.
+"""
+
+from functools import lru_cache
 
 from prometheus_client import Counter, Histogram, Gauge
+from prometheus_client.metrics import MetricWrapperBase
 
 # Document processing metrics
 documents_uploaded_total = Counter(
@@ -130,3 +148,41 @@ api_request_duration_seconds = Histogram(
     ["method", "endpoint"],
     buckets=[0.01, 0.05, 0.1, 0.5, 1, 2, 5],
 )
+
+
+@lru_cache(maxsize=1024)
+def bound(metric: MetricWrapperBase, *label_values: str) -> MetricWrapperBase:
+    """
+    Get the child of a labelled metric, cached per label combination.
+
+    Args:
+        metric: Labelled metric
+        label_values: Label values in the metric's declared label order
+
+    Returns:
+        Metric child to call inc()/observe()/set() on
+    """
+    return metric.labels(*label_values)
+
+
+def remove_labels(metric: MetricWrapperBase, *label_values: str) -> None:
+    """
+    Remove one child of a labelled metric, along with cached handles to it.
+
+    Args:
+        metric: Labelled metric
+        label_values: Label values in the metric's declared label order
+    """
+    metric.remove(*label_values)
+    bound.cache_clear()
+
+
+def clear_labels(metric: MetricWrapperBase) -> None:
+    """
+    Remove all children of a labelled metric, along with cached handles to them.
+
+    Args:
+        metric: Labelled metric
+    """
+    metric.clear()
+    bound.cache_clear()
@@ -1,5 +1,12 @@
 """Retry utilities with exponential backoff."""
 
+import asyncio
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -36,3 +43,66 @@ def create_retry_decorator(
         retry=retry_if_exception_type(exceptions),
         reraise=True,
     )
+
+
+def fast_retry(
+    max_attempts: int = 3,
+    min_wait_seconds: int = 1,
+    max_wait_seconds: int = 10,
+    exceptions: tuple[type[Exception], ...] = (Exception,),
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Create a lightweight retry decorator with exponential backoff.
+
+    Retries with the same schedule as create_retry_decorator, but as a plain
+    loop: a call that succeeds on the first attempt costs one extra frame
+    and a try block, with no per-call retry state. Works on both sync and
+    async functions. Use create_retry_decorator when tenacity's callbacks
+    or statistics are needed.
+
+    Args:
+        max_attempts: Maximum number of retry attempts
+        min_wait_seconds: Minimum wait time between retries
+        max_wait_seconds: Maximum wait time between retries
+        exceptions: Tuple of exceptions to retry on
+
+    Returns:
+        Configured retry decorator
+    """
+
+    def backoff(attempt: int) -> float:
+        # Same as tenacity's wait_exponential(multiplier=1)
+        return max(min_wait_seconds, min(2.0 ** (attempt - 1), max_wait_seconds))
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                attempt = 1
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions:
+                        if attempt >= max_attempts:
+                            raise
+                    await asyncio.sleep(backoff(attempt))
+                    attempt += 1
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 1
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except exceptions:
+                    if attempt >= max_attempts:
+                        raise
+                time.sleep(backoff(attempt))
+                attempt += 1
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,57 @@
+"""Tests for image preprocessing."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.processors.image_processor import ImageProcessor
+
+
+def make_page(skew: float, dense: bool) -> np.ndarray:
+    """Render horizontal text-like bars and rotate them by ``skew`` degrees."""
+    page = np.full((1000, 800), 0 if dense else 255, dtype=np.uint8)
+    for y in range(120, 880, 24):
+        if dense:
+            page[y : y + 10, 100:700] = 255
+        else:
+            page[y : y + 6, 100:700] = 0
+
+    matrix = cv2.getRotationMatrix2D((400, 500), skew, 1.0)
+    return cv2.warpAffine(page, matrix, (800, 1000), borderValue=0 if dense else 255)
+
+
+def row_profile_variance(page: np.ndarray) -> float:
+    """Score how sharply the bars line up with the rows."""
+    return float(page.mean(axis=1).var())
+
+
+def binarize(page: np.ndarray) -> np.ndarray:
+    """Threshold a page the same way the deskew step does."""
+    _, binary = cv2.threshold(page, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    return binary
+
+
+@pytest.mark.parametrize("skew", [-7.0, -3.0, -1.0, 1.0, 3.0, 7.0])
+def test_min_area_rect_angle_undoes_skew_in_both_directions(skew: float) -> None:
+    binary = binarize(make_page(skew, dense=False))
+
+    assert ImageProcessor._min_area_rect_angle(binary) == pytest.approx(-skew, abs=0.5)
+
+
+@pytest.mark.parametrize("skew", [-3.0, -1.0, 1.0, 3.0])
+def test_projection_profile_angle_undoes_skew_in_both_directions(skew: float) -> None:
+    binary = binarize(make_page(skew, dense=True))
+
+    assert ImageProcessor._projection_profile_angle(binary) == pytest.approx(-skew, abs=0.5)
+
+
+@pytest.mark.parametrize("dense", [False, True], ids=["min_area_rect", "projection_profile"])
+@pytest.mark.parametrize("skew", [-3.0, 3.0])
+def test_deskew_straightens_page(skew: float, dense: bool) -> None:
+    processor = ImageProcessor(deskew=True)
+    skewed = make_page(skew, dense=dense)
+    straight = make_page(0.0, dense=dense)
+
+    deskewed = processor._deskew_image(skewed)
+
+    assert row_profile_variance(deskewed) > 0.8 * row_profile_variance(straight)
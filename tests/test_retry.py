@@ -0,0 +1,91 @@
+"""Tests for the retry decorators."""
+
+from collections.abc import Callable
+
+import pytest
+
+from src.utils import retry
+from src.utils.retry import fast_retry
+
+
+class FlakyError(Exception):
+    """Raised by the functions under test until they are allowed to succeed."""
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record backoff delays instead of sleeping."""
+    recorded: list[float] = []
+
+    async def fake_async_sleep(seconds: float) -> None:
+        recorded.append(seconds)
+
+    monkeypatch.setattr(retry.time, "sleep", recorded.append)
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_async_sleep)
+    return recorded
+
+
+def make_flaky(failures: int) -> tuple[list[int], Callable[[], str]]:
+    """Build a function that fails ``failures`` times, then returns "ok"."""
+    calls: list[int] = []
+
+    def func() -> str:
+        calls.append(1)
+        if len(calls) <= failures:
+            raise FlakyError()
+        return "ok"
+
+    return calls, func
+
+
+def test_retries_until_success(sleeps: list[float]) -> None:
+    calls, func = make_flaky(failures=2)
+
+    assert fast_retry(max_attempts=3)(func)() == "ok"
+    assert len(calls) == 3
+    assert sleeps == [1, 2]
+
+
+def test_reraises_after_final_attempt(sleeps: list[float]) -> None:
+    calls, func = make_flaky(failures=5)
+
+    with pytest.raises(FlakyError):
+        fast_retry(max_attempts=3)(func)()
+    assert len(calls) == 3
+    assert sleeps == [1, 2]
+
+
+def test_backoff_is_bounded(sleeps: list[float]) -> None:
+    _, func = make_flaky(failures=10)
+
+    with pytest.raises(FlakyError):
+        fast_retry(max_attempts=7, min_wait_seconds=3, max_wait_seconds=10)(func)()
+    assert sleeps == [3, 3, 4, 8, 10, 10]
+
+
+def test_does_not_retry_other_exceptions(sleeps: list[float]) -> None:
+    calls: list[int] = []
+
+    @fast_retry(max_attempts=3, exceptions=(FlakyError,))
+    def func() -> None:
+        calls.append(1)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        func()
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+async def test_async_retries_and_reraises(sleeps: list[float]) -> None:
+    calls: list[int] = []
+
+    @fast_retry(max_attempts=4, max_wait_seconds=2)
+    async def func() -> None:
+        calls.append(1)
+        raise FlakyError()
+
+    with pytest.raises(FlakyError):
+        await func()
+    assert len(calls) == 4
+    assert sleeps == [1, 2, 2]